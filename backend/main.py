@@ -2,26 +2,27 @@
 
 import asyncio
 import os
+import aiofiles
 import uuid
 import io
+import shutil
+import time
 import wave
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from fastapi import FastAPI, BackgroundTasks, HTTPException, WebSocket, WebSocketDisconnect, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
-from typing import Any, List, Optional, Dict
+from pydantic import BaseModel
+from typing import AsyncIterator, Deque, List, Optional, Tuple
 
 # --- OpenAI Integration for Transcription ---
 try:
-    from openai import OpenAI
-    from dotenv import load_dotenv
-    load_dotenv()
-    # Initialize OpenAI client
-    if os.getenv("OPENAI_API_KEY"):
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # Shared client (and connection pool) with the analysis workflow
+    from utils.clients import openai_client as client
+    if client is not None:
         HAS_OPENAI = True
         print("OpenAI client initialized for live transcription.")
     else:
@@ -29,7 +30,7 @@ try:
         print("Warning: OPENAI_API_KEY not found. Live transcription will be disabled.")
 except ImportError:
     HAS_OPENAI = False
-    print("Warning: 'openai' or 'python-dotenv' not installed. Live transcription disabled.")
+    print("Warning: 'openai', 'httpx' or 'python-dotenv' not installed. Live transcription disabled.")
 
 
 # --- Import Local Modules (Analysis & Email) ---
@@ -43,11 +44,28 @@ except ImportError:
         print(f"Analysis skipped: analysis.py module not found.")
 
 try:
-    from utils.email_service import EmailService
+    from utils.email_service import EmailService, EmailRequest
     HAS_EMAIL = True
 except ImportError:
     HAS_EMAIL = False
     print("Warning: email_service.py not found. Email features will be disabled.")
+    # Same fields as utils.email_service.EmailRequest; the email routes reject requests anyway
+    class EmailRequest(BaseModel):
+        to_email: str
+        subject: str = "Meeting Report from Notes Taker"
+        message: str = "Please find your meeting report attached."
+        pdf_path: str
+        cc_emails: Optional[List[str]] = None
+        bcc_emails: Optional[List[str]] = None
+
+try:
+    from utils.dsp import has_speech
+    HAS_DSP = True
+except ImportError:
+    HAS_DSP = False
+    print("Warning: 'numpy' not installed. Silent live audio will not be skipped.")
+
+from utils.session_store import create_session_store
 
 
 # --- FastAPI Application Setup ---
@@ -67,42 +85,123 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- Static File Serving for Reports ---
+# --- File Serving for Recordings & Reports ---
 os.makedirs("recordings", exist_ok=True)
-app.mount("/recordings", StaticFiles(directory="recordings"), name="recordings")
+RECORDINGS_DIR = Path("recordings").resolve()
+
+class RecordingFileResponse(FileResponse):
+    # Large audio files stream in 1MB reads instead of the 64KB default; servers
+    # supporting the ASGI pathsend extension hand the file to the kernel instead.
+    chunk_size = 1024 * 1024
 
 
 # --- Application State & Pydantic Models ---
-active_sessions: Dict[str, Dict[str, Any]] = {}
+# Sessions live in Redis when REDIS_URL is set so multiple workers can share them
+active_sessions = create_session_store()
 email_service = EmailService() if HAS_EMAIL else None
 
-class EmailRequest(BaseModel):
-    to_email: EmailStr
-    subject: str = "Meeting Report from Notes Taker"
-    message: str = "Please find your meeting report attached."
-    pdf_path: str
-    cc_emails: Optional[List[EmailStr]] = None
-    bcc_emails: Optional[List[EmailStr]] = None
+# --- Live Transcription Settings ---
+# Live audio is transcribed over a rolling window instead of re-sending the whole
+# recording on every chunk, so each transcription call costs O(window), not O(session).
+LIVE_WINDOW_SECONDS = 20.0            # Window length before its text is committed
+LIVE_PARTIAL_INTERVAL_SECONDS = 2.0   # New audio required between Whisper calls
+LIVE_MIN_TRANSCRIBE_SECONDS = 1.0     # Skip windows too short to contain speech
+LIVE_MAX_BUFFER_BYTES = 5 * 1024 * 1024  # ~5 minutes of WebM/Opus; close the socket past this
+LIVE_SEND_TIMEOUT_SECONDS = 2.0       # Give up on a delta if the client isn't reading
+LIVE_REQUEST_TIMEOUT_SECONDS = 15.0   # Per-call OpenAI timeout; the shared client's 600s is for analysis
+LIVE_SAMPLE_RATE = 16000              # PCM rate used for the silence gate
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"  # Matroska/WebM Cluster element ID
+# Streaming-capable models let live text reach the client while a window is still decoding
+LIVE_TRANSCRIPTION_MODEL = os.getenv("LIVE_TRANSCRIPTION_MODEL", "gpt-4o-mini-transcribe")
+NON_STREAMING_MODELS = {"whisper-1"}
 
-# --- Live Transcription Helper Function ---
-async def transcribe_audio_chunk(audio_bytes: bytes, session_id_for_log: str) -> Optional[str]:
-    if not HAS_OPENAI or not audio_bytes:
-        return None
+# --- Live Transcription Helper Functions ---
+def cluster_starts(data: bytes, start: int = 0) -> List[int]:
+    """
+    Returns the offsets of WebM Cluster elements in `data` at or after `start`.
+    A match only counts when a valid size field and the Cluster's Timecode element
+    (ID 0xE7) follow it, so ID-like bytes inside Opus payloads are skipped.
+    """
+    offsets = []
+    i = data.find(WEBM_CLUSTER_ID, start)
+    while i != -1:
+        size_pos = i + len(WEBM_CLUSTER_ID)
+        if size_pos < len(data) and data[size_pos]:
+            timecode_pos = size_pos + 9 - data[size_pos].bit_length()  # EBML size is a VINT
+            if timecode_pos < len(data) and data[timecode_pos] == 0xE7:
+                offsets.append(i)
+        i = data.find(WEBM_CLUSTER_ID, i + 1)
+    return offsets
+
+def webm_init_segment(first_fragment: bytes) -> bytes:
+    """Returns the WebM header (everything before the first Cluster) of a MediaRecorder stream."""
+    starts = cluster_starts(first_fragment)
+    return first_fragment[:starts[0]] if starts else b""
+
+async def decode_to_pcm(audio_bytes: bytes) -> Optional[bytes]:
+    """Decodes a WebM window to 16 kHz mono 16-bit PCM with ffmpeg; None if decoding fails."""
     try:
-        audio_file = io.BytesIO(audio_bytes)
-        audio_file.name = "stream.webm"
-        
-        # Auto-detects language by not specifying the language parameter
-        transcript = await asyncio.to_thread(
-            client.audio.transcriptions.create,
-            model="whisper-1",
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+            "-f", "s16le", "-ar", str(LIVE_SAMPLE_RATE), "-ac", "1", "pipe:1",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        pcm, _ = await process.communicate(audio_bytes)
+    except OSError:
+        return None
+    return pcm if process.returncode == 0 and pcm else None
+
+async def window_is_silent(audio_bytes: bytes) -> bool:
+    """True when a live window decodes cleanly and contains no speech-level energy."""
+    if not HAS_DSP:
+        return False
+    pcm = await decode_to_pcm(audio_bytes)
+    if pcm is None:
+        return False
+    # Off the event loop: the first call pays for Numba JIT compilation
+    return not await asyncio.to_thread(has_speech, pcm, sample_rate=LIVE_SAMPLE_RATE)
+
+async def stream_audio_chunk(audio_bytes: bytes, session_id_for_log: str) -> AsyncIterator[str]:
+    """
+    Transcribes a live window, yielding the cumulative text as it streams in.
+    Models without streaming support (whisper-1) yield the full text once.
+    The last value yielded is always the complete, stripped transcript (possibly
+    empty). Errors, including a stream that ends before 'transcript.text.done',
+    are raised so the caller never mistakes a truncated text for a result.
+    """
+    if not HAS_OPENAI or not audio_bytes:
+        return
+    audio_file = io.BytesIO(audio_bytes)
+    audio_file.name = "stream.webm"
+    # Fail fast and without SDK retries: a stalled call holds the session's only
+    # transcription slot, and the next call already retries with newer audio
+    live_client = client.with_options(timeout=LIVE_REQUEST_TIMEOUT_SECONDS, max_retries=0)
+    
+    # Auto-detects language by not specifying the language parameter
+    if LIVE_TRANSCRIPTION_MODEL in NON_STREAMING_MODELS:
+        transcript = await live_client.audio.transcriptions.create(
+            model=LIVE_TRANSCRIPTION_MODEL,
             file=audio_file,
             response_format="text"
         )
-        return transcript.strip() if transcript else None
-    except Exception as e:
-        print(f"[{session_id_for_log[:6]}] Error during transcription: {e}")
-        return None
+        yield (transcript or "").strip()
+        return
+
+    stream = await live_client.audio.transcriptions.create(
+        model=LIVE_TRANSCRIPTION_MODEL,
+        file=audio_file,
+        response_format="text",
+        stream=True
+    )
+    text = ""
+    async for event in stream:
+        if event.type == "transcript.text.delta":
+            text += event.delta
+            yield text
+        elif event.type == "transcript.text.done":
+            yield event.text.strip()
+            return
+    raise RuntimeError(f"[{session_id_for_log[:6]}] Transcription stream ended before completion")
 
 # --- API Endpoints ---
 
@@ -117,29 +216,28 @@ async def start_session():
     session_folder = Path("recordings") / f"session_{timestamp}_{session_id[:8]}"
     os.makedirs(session_folder, exist_ok=True)
 
-    active_sessions[session_id] = {
-        "folder_path": session_folder,
-        "start_time": datetime.now(),
-        "file_path": session_folder / "audio.wav",
-        "transcript_path": session_folder / "transcript.txt"
-    }
+    await active_sessions.set(session_id, {
+        "folder_path": str(session_folder),
+        "start_time": datetime.now().isoformat(),
+        "file_path": str(session_folder / "audio.wav"),
+        "transcript_path": str(session_folder / "transcript.txt")
+    })
     print(f"Started new session: {session_id}")
     return {"session_id": session_id}
 
 @app.post("/api/v1/sessions/upload-audio/{session_id}")
 async def upload_audio(session_id: str, background_tasks: BackgroundTasks, audio_file: UploadFile = File(...)):
-    if session_id not in active_sessions:
+    session = await active_sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found or already closed.")
     
-    session = active_sessions[session_id]
-    file_path = session["file_path"]
+    file_path = Path(session["file_path"])
     try:
         with open(file_path, "wb") as f:
-            while content := await audio_file.read(1024 * 1024): # Read in 1MB chunks
-                f.write(content)
+            # Copy in 1MB blocks on a worker thread so the event loop never blocks on disk
+            await asyncio.to_thread(shutil.copyfileobj, audio_file.file, f, 1024 * 1024)
     except Exception as e:
-        if session_id in active_sessions:
-            del active_sessions[session_id]
+        await active_sessions.delete(session_id)
         raise HTTPException(status_code=500, detail=f"Failed to save audio file: {e}")
 
     if HAS_ANALYSIS:
@@ -148,9 +246,8 @@ async def upload_audio(session_id: str, background_tasks: BackgroundTasks, audio
     else:
         analysis_message = "Analysis module not available."
     
-    if session_id in active_sessions:
-        del active_sessions[session_id]
-        print(f"Session {session_id} closed and cleaned up after successful upload.")
+    await active_sessions.delete(session_id)
+    print(f"Session {session_id} closed and cleaned up after successful upload.")
 
     return {
         "status": "success", "message": f"Audio uploaded. {analysis_message}",
@@ -161,47 +258,174 @@ async def upload_audio(session_id: str, background_tasks: BackgroundTasks, audio
 @app.websocket("/ws/live/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     await websocket.accept()
-    if session_id not in active_sessions or not HAS_OPENAI:
+    session = await active_sessions.get(session_id)
+    if session is None or not HAS_OPENAI:
         reason = "Session not found or OpenAI not configured"
         await websocket.close(code=1008, reason=reason)
         return
+    transcript_path = session["transcript_path"]
 
     print(f"WebSocket client connected for session {session_id}.")
-    
-    frames = bytearray()
-    last_full_transcription = ""
+
+    # Only the first MediaRecorder fragment carries the WebM header; it is kept
+    # aside and prepended to every window. MediaRecorder cuts fragments on a timer,
+    # not on Cluster boundaries, so incoming bytes are regrouped into whole Clusters:
+    # a window must start on a Cluster for the header + window to decode cleanly.
+    init_segment: Optional[bytes] = None
+    segments: Deque[Tuple[float, bytes]] = deque()  # Complete Clusters
+    cluster_tail = bytearray()                      # The Cluster still being received
+    buffered_bytes = 0
+    window_started_at = last_transcribed_at = time.monotonic()
+
+    # Committed windows are appended to transcript.txt as they slide past, so
+    # memory stays bounded and the transcript survives a crash mid-session.
+    has_transcript = False          # Whether any text has been written yet
+    hypothesis: List[str] = []      # Latest transcription of the current window
+    shown: List[str] = []           # Words of the current window the client is displaying
+
+    # At most one Whisper call is in flight per session; it runs as a task so the
+    # socket keeps being drained (and the buffer cap enforced) while it waits.
+    transcription_task: Optional[asyncio.Task] = None
+
+    async def send_update(kind: str, words: List[str]):
+        """
+        Sends the current window's full text. The client replaces its 'partial'
+        line with each update, and a 'final' message fixes it in place.
+        """
+        nonlocal shown
+        text = " ".join(words)
+        if kind == "final":
+            print(f"[Live Transcript - {session_id[:6]}]: {text}")
+        try:
+            await asyncio.wait_for(
+                websocket.send_json({"type": kind, "text": text}), timeout=LIVE_SEND_TIMEOUT_SECONDS
+            )
+            shown = words
+        except asyncio.TimeoutError:
+            print(f"[{session_id[:6]}] Client is not reading; skipped a live update.")
+
+    async def append_transcript(words: List[str]):
+        """Appends committed words to the session's transcript file."""
+        nonlocal has_transcript
+        if not words:
+            return
+        async with aiofiles.open(transcript_path, "a", encoding="utf-8") as f:
+            await f.write((" " if has_transcript else "") + " ".join(words))
+        has_transcript = True
+
+    async def transcribe_window(window_audio: bytes, window_end: float, segment_count: int, window_full: bool):
+        nonlocal hypothesis, shown
+        nonlocal buffered_bytes, window_started_at
+
+        transcript_text: Optional[str] = None
+        # Silent windows skip the transcription call entirely but still advance the window
+        if await window_is_silent(window_audio):
+            transcript_text = ""
+        else:
+            try:
+                async for transcript_text in stream_audio_chunk(window_audio, session_id):
+                    # The last streamed token may be a partial word, so hold it back
+                    words = transcript_text.split()
+                    if not transcript_text[-1:].isspace():
+                        words = words[:-1]
+                    # Each pass re-transcribes the window from the start and may revise
+                    # early words. Until it has caught up with the text the client
+                    # shows, keep that text instead of collapsing the line and regrowing it.
+                    if len(words) >= len(shown) and words != shown:
+                        await send_update("partial", words)
+            except Exception as e:
+                # Nothing is committed or trimmed; the next call retries this audio
+                print(f"[{session_id[:6]}] Error during transcription: {e}")
+                transcript_text = None
+        if transcript_text is None:
+            if not window_full:
+                return
+            # A full window is not retried: under persistent errors (rate limits, a bad
+            # key, rejected audio) it would grow and be re-uploaded until the buffer cap
+            # closes the socket. Its audio is dropped, keeping the last good partial text.
+            print(f"[{session_id[:6]}] Dropping a live window that could not be transcribed.")
+            transcript_text = " ".join(hypothesis)
+
+        hypothesis = transcript_text.split()
+        if window_full:
+            await send_update("final", hypothesis)
+            await append_transcript(hypothesis)
+            # Drop only the Clusters that were transcribed; later audio stays
+            for _ in range(segment_count):
+                buffered_bytes -= len(segments.popleft()[1])
+            window_started_at = window_end
+            hypothesis, shown = [], []
+        elif hypothesis != shown:
+            await send_update("partial", hypothesis)
 
     try:
         while True:
             audio_data = await websocket.receive_bytes()
-            frames.extend(audio_data)
-            
-            combined_audio = bytes(frames)
-            transcript_text = await transcribe_audio_chunk(combined_audio, session_id)
-            
-            if transcript_text and transcript_text != last_full_transcription:
-                new_text = transcript_text[len(last_full_transcription):].strip()
-
-                if new_text:
-                    print(f"[Live Transcript - {session_id[:6]}]: {new_text}")
-                    await websocket.send_text(new_text)
-                
-                last_full_transcription = transcript_text
+            now = time.monotonic()
+            if init_segment is None:
+                init_segment = webm_init_segment(audio_data)
+                audio_data = audio_data[len(init_segment):]
+            cluster_tail += audio_data
+            buffered_bytes += len(audio_data)
+            # Move every Cluster that is now complete out of the tail
+            cluster_end = 0
+            for start in cluster_starts(cluster_tail, 1):
+                segments.append((now, bytes(cluster_tail[cluster_end:start])))
+                cluster_end = start
+            del cluster_tail[:cluster_end]
+
+            if buffered_bytes > LIVE_MAX_BUFFER_BYTES:
+                print(f"[{session_id[:6]}] Live audio buffer limit exceeded; closing connection.")
+                await websocket.close(code=1009, reason="Live audio buffer limit exceeded")
+                break
+
+            if transcription_task is not None:
+                if not transcription_task.done():
+                    continue
+                transcription_task.result()  # Surface unexpected errors from the last call
+                transcription_task = None
+
+            if now - last_transcribed_at < LIVE_PARTIAL_INTERVAL_SECONDS:
+                continue
+            if now - window_started_at < LIVE_MIN_TRANSCRIBE_SECONDS:
+                continue
+            last_transcribed_at = now
+
+            # Only whole Clusters are committed and dropped. Partial updates also
+            # include the Cluster in progress; a committing pass leaves it for the
+            # next window, so its audio is never cut in two.
+            window_full = now - window_started_at >= LIVE_WINDOW_SECONDS and len(segments) > 0
+            window_audio = init_segment + b"".join(segment for _, segment in segments)
+            if not window_full:
+                window_audio += cluster_tail
+            transcription_task = asyncio.create_task(
+                transcribe_window(window_audio, now, len(segments), window_full)
+            )
 
     except WebSocketDisconnect:
         print(f"WebSocket client for session {session_id} disconnected.")
     except Exception as e:
         print(f"An error occurred in the WebSocket for session {session_id}: {e}")
     finally:
-        if session_id in active_sessions and last_full_transcription:
-            transcript_path = active_sessions[session_id]["transcript_path"]
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                f.write(last_full_transcription)
-            print(f"Full live transcript saved for session {session_id}")
+        if transcription_task is not None and not transcription_task.done():
+            transcription_task.cancel()
+        # Only the still-uncommitted tail of the current window remains to be written
+        if await active_sessions.get(session_id) is not None:
+            await append_transcript(hypothesis)
+            if has_transcript:
+                print(f"Full live transcript saved for session {session_id}")
         
+@app.api_route("/recordings/{file_path:path}", methods=["GET", "HEAD"])
+async def get_recording(file_path: str):
+    # FileResponse answers Range requests, so the browser audio player can seek
+    path = (RECORDINGS_DIR / file_path).resolve()
+    if RECORDINGS_DIR not in path.parents or not path.is_file():
+        raise HTTPException(status_code=404, detail="File not found.")
+    return RecordingFileResponse(path)
+
 @app.get("/api/v1/status")
-def get_status():
-    return {"active_session_count": len(active_sessions)}
+async def get_status():
+    return {"active_session_count": await active_sessions.count()}
 
 @app.post("/api/v1/email/send")
 async def send_email(email_request: EmailRequest):
@@ -211,11 +435,24 @@ async def send_email(email_request: EmailRequest):
         pdf_path = Path(email_request.pdf_path.strip("/")).resolve()
         if Path("recordings").resolve() not in pdf_path.parents:
             raise HTTPException(status_code=400, detail="Invalid file path.")
-        result = email_service.send_email_with_attachment(email_request)
+        # SMTP (and its retry backoff) is blocking, so the send runs off the event loop
+        result = await asyncio.to_thread(email_service.send_email_with_attachment, email_request)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to send email: {e}")
 
+@app.post("/api/v1/email/send-bulk")
+async def send_bulk_email(email_requests: List[EmailRequest]):
+    if not HAS_EMAIL or not email_service:
+        raise HTTPException(status_code=503, detail="Email service is not configured.")
+    for email_request in email_requests:
+        pdf_path = Path(email_request.pdf_path.strip("/")).resolve()
+        if RECORDINGS_DIR not in pdf_path.parents:
+            raise HTTPException(status_code=400, detail=f"Invalid file path: {email_request.pdf_path}")
+    # SMTP is blocking, so the parallel sends run off the event loop
+    results = await asyncio.to_thread(email_service.send_bulk, email_requests)
+    return {"sent": sum(1 for r in results if r["success"]), "results": results}
+
 # Mount the static directory for the frontend LAST
 os.makedirs("static", exist_ok=True)
 app.mount("/", StaticFiles(directory="static", html=True), name="static")
@@ -229,5 +466,8 @@ if __name__ == "__main__":
     print(f" OpenAI for Live Transcription: {'✅ Available' if HAS_OPENAI else '❌ Not configured'}")
     print(f" Analysis Module: {'✅ Available' if HAS_ANALYSIS else '❌ Not found'}")
     print(f" Email Service:  {'✅ Available' if HAS_EMAIL else '❌ Not configured'}")
+    print(f" Session Store:  {'✅ Redis (shared)' if active_sessions.is_shared else 'In-process'}")
     print("=" * 60)
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # Multiple workers need the shared (Redis) session store; reload only works with one
+    workers = int(os.getenv("UVICORN_WORKERS", "1")) if active_sessions.is_shared else 1
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=workers == 1, workers=workers)
@@ -1,10 +1,14 @@
 # analysis.py - Full Analysis Workflow for Note Taker
 import os
 import re
+import glob
 import io
 import base64
 import asyncio
+import concurrent.futures
+import multiprocessing
 import subprocess
+import wave
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
@@ -18,36 +22,99 @@ from reportlab.lib.units import inch
 
 # Third-party libraries
 try:
-    from dotenv import load_dotenv
-    from openai import OpenAI
+    import aiofiles
     from pydantic import BaseModel
     from PIL import Image
+    from utils.clients import OPENAI_API_KEY, openai_client as client
 except ImportError as e:
     raise ImportError(
         "A required dependency is missing. "
-        "Please run: pip install python-dotenv openai pydantic Pillow reportlab. "
+        "Please run: pip install python-dotenv openai httpx aiofiles pydantic Pillow reportlab. "
         f"Original error: {e}"
     )
 
 # ==============================================================================
 # CONFIGURATION & CLIENT INITIALIZATION
 # ==============================================================================
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     print("WARNING: OPENAI_API_KEY is not set. Analysis using OpenAI will fail.")
-client = OpenAI(api_key=OPENAI_API_KEY)
+
+# Caps on in-flight requests per API type to stay under OpenAI rate limits
+OPENAI_MAX_CONCURRENCY = 20
+whisper_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+chat_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
 
 # ==============================================================================
 # HELPER FUNCTIONS & CLASSES
 # ==============================================================================
 
+async def limited(semaphore: asyncio.Semaphore, coro):
+    """Awaits a coroutine while holding a slot of the given semaphore."""
+    async with semaphore:
+        return await coro
+
+def parsed_content(response):
+    """Returns the structured output of a parsed chat completion, raising on refusal."""
+    message = response.choices[0].message
+    if message.parsed is None:
+        raise ValueError(message.refusal or "Model returned no structured output.")
+    return message.parsed
+
 class TranscriptionOutput(BaseModel):
     """Pydantic model for the output of the transcription agent."""
     transcription: str
     raw_translation: str
     refined_translation: str
 
+class SentimentOutput(BaseModel):
+    """Pydantic model for the sentiment analysis of one transcript segment."""
+    overall_emotion: str
+    key_insights: List[str]
+
+    def to_markdown(self, time_label: str) -> str:
+        insights = "\n".join(f"- {insight}" for insight in self.key_insights)
+        return (
+            f"**Time:** {time_label}\n"
+            f"**Overall Emotion:** {self.overall_emotion}\n"
+            f"**Key Insights:**\n{insights}"
+        )
+
+class ActionItem(BaseModel):
+    """Pydantic model for a single task assigned during the meeting."""
+    assignee: str
+    task: str
+
+class MeetingSummary(BaseModel):
+    """Pydantic model for the summary section of the meeting report."""
+    executive_summary: str
+    key_discussion_points: List[str]
+    action_items: List[ActionItem]
+
+    def to_markdown(self) -> str:
+        points = "\n".join(f"- {point}" for point in self.key_discussion_points)
+        actions = "\n".join(f"- **{item.assignee}:** {item.task}" for item in self.action_items)
+        return (
+            f"## Executive Summary\n{self.executive_summary}\n\n"
+            f"## Key Discussion Points\n{points}\n\n"
+            f"## Action Items\n{actions or '- No action items were assigned.'}"
+        )
+
+class MeetingInsights(BaseModel):
+    """Pydantic model for the team-dynamics section of the meeting report."""
+    emotional_tone: str
+    engagement_level: str
+    potential_conflicts: str
+    leadership_behavior: str
+
+    def to_markdown(self) -> str:
+        return (
+            "## Meeting Insights\n"
+            f"- **Emotional Tone:** {self.emotional_tone}\n"
+            f"- **Engagement Level:** {self.engagement_level}\n"
+            f"- **Potential Conflicts:** {self.potential_conflicts}\n"
+            f"- **Leadership Behavior:** {self.leadership_behavior}"
+        )
+
 async def convert_to_standard_wav(input_path: str, output_path: str) -> bool:
     """Converts any audio file to a standard PCM WAV format."""
     print(f"🔹 Converting {os.path.basename(input_path)} to standard WAV format...")
@@ -64,47 +131,46 @@ async def convert_to_standard_wav(input_path: str, output_path: str) -> bool:
     print(f"✅ Conversion successful. Standard WAV saved to: {os.path.basename(output_path)}")
     return True
 
-async def split_audio(audio_path: str, output_dir: str, chunk_duration: int = 600) -> List[str]:
-    """Splits an audio file into smaller chunks."""
+def get_wav_duration(wav_path: str) -> Optional[float]:
+    """Reads a WAV file's duration from its header, without spawning ffprobe."""
+    try:
+        with wave.open(wav_path, "rb") as wf:
+            return wf.getnframes() / wf.getframerate()
+    except (wave.Error, OSError, ZeroDivisionError) as e:
+        print(f"❌ Error reading WAV duration: {e}")
+        return None
+
+async def split_audio(audio_path: str, output_dir: str, chunk_duration: int = 600,
+                      duration: Optional[float] = None) -> List[str]:
+    """
+    Splits a standard WAV file into WAV chunks in a single ffmpeg pass.
+    The PCM is copied as-is (no re-encode); 10 minutes of 16 kHz mono is ~19 MB,
+    under Whisper's 25 MB upload limit. When the known duration fits in one chunk,
+    the file is used as-is.
+    """
+    if duration is not None and duration <= chunk_duration:
+        print(f"🔹 Audio is {duration:.0f}s long; using it as a single chunk.")
+        return [audio_path]
+
     print("🔹 Splitting audio into chunks...")
     os.makedirs(output_dir, exist_ok=True)
-    
-    get_duration_cmd = [
-        "ffprobe", "-v", "error", "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1", audio_path
+
+    command = [
+        "ffmpeg", "-i", audio_path, "-f", "segment", "-segment_time", str(chunk_duration),
+        "-c:a", "copy", "-reset_timestamps", "1",
+        os.path.join(output_dir, "chunk_%02d.wav"), "-y"
     ]
-    
     process = await asyncio.to_thread(
-        subprocess.run, get_duration_cmd, capture_output=True, text=True, check=False
+        subprocess.run, command, capture_output=True, text=True, check=False
     )
     if process.returncode != 0:
-        print(f"❌ Error getting audio duration: {process.stderr}")
+        print(f"❌ Error splitting audio: {process.stderr}")
         return []
-    
-    try:
-        total_duration = float(process.stdout.strip())
-    except (ValueError, TypeError):
-        print(f"❌ Error: ffprobe could not determine audio duration. Output was: '{process.stdout.strip()}'")
-        return []
-
-    output_files = []
-    tasks = []
-
-    for i in range(int(total_duration // chunk_duration) + 1):
-        start_time = i * chunk_duration
-        output_file = os.path.join(output_dir, f"chunk_{i:02d}.mp3")
-        command = [
-            "ffmpeg", "-i", audio_path, "-ss", str(start_time), "-t", str(chunk_duration),
-            "-c:a", "libmp3lame", "-q:a", "2", output_file, "-y"
-        ]
-        task = asyncio.to_thread(subprocess.run, command, capture_output=True)
-        tasks.append((task, output_file))
-
-    await asyncio.gather(*[t for t, _ in tasks])
 
-    for _, output_file in tasks:
-        if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-            output_files.append(output_file)
+    output_files = [
+        path for path in sorted(glob.glob(os.path.join(output_dir, "chunk_*.wav")))
+        if os.path.getsize(path) > 0
+    ]
 
     print(f"✅ Audio split into {len(output_files)} chunks.")
     return output_files
@@ -117,12 +183,17 @@ async def run_transcription_agent(input_audio_path: str) -> TranscriptionOutput:
         with open(input_audio_path, "rb") as f:
             audio_data = f.read()
 
-        with open(input_audio_path, "rb") as f:
-            transcription = client.audio.transcriptions.create(model="whisper-1", file=f)
+        # Both requests share the single read; each gets its own stream position
+        transcription_io = io.BytesIO(audio_data)
+        transcription_io.name = "audio.wav"
+        translation_io = io.BytesIO(audio_data)
+        translation_io.name = "audio.wav"
 
-        audio_io = io.BytesIO(audio_data)
-        audio_io.name = "audio.mp3"
-        translation = client.audio.translations.create(model="whisper-1", file=audio_io)
+        # Transcription and translation are independent, so run them concurrently
+        transcription, translation = await asyncio.gather(
+            limited(whisper_semaphore, client.audio.transcriptions.create(model="whisper-1", file=transcription_io)),
+            limited(whisper_semaphore, client.audio.translations.create(model="whisper-1", file=translation_io))
+        )
 
         system_prompt = (
             "You are a professional meeting transcript formatter.\n"
@@ -137,13 +208,13 @@ async def run_transcription_agent(input_audio_path: str) -> TranscriptionOutput:
             "6. Output only the final cleaned-up transcript."
         )
         
-        chat_response = client.chat.completions.create(
+        chat_response = await limited(chat_semaphore, client.chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": translation.text}
             ]
-        )
+        ))
         refined_conversation = chat_response.choices[0].message.content.strip()
 
         print(f"✅ Transcription complete for {os.path.basename(input_audio_path)}.")
@@ -156,15 +227,15 @@ async def run_transcription_agent(input_audio_path: str) -> TranscriptionOutput:
         print(f"❌ Error during transcription for {input_audio_path}: {e}")
         return TranscriptionOutput(transcription="", raw_translation="", refined_translation="")
 
-def save_text_to_file(text: str, path: str):
-    """Saves text content to a file."""
+async def save_text_to_file(text: str, path: str):
+    """Saves text content to a file without blocking the event loop."""
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(text)
+    async with aiofiles.open(path, "w", encoding="utf-8") as f:
+        await f.write(text)
     print(f"✅ Content saved to: {path}")
 
 async def analyze_sentiment_from_text(transcript_chunk: str, time_label: str) -> str:
-    """Analyzes sentiment from a transcript chunk using GPT-4o."""
+    """Analyzes sentiment from a transcript chunk using GPT-4o-mini."""
     print(f"🔹 Analyzing text sentiment for {time_label}...")
     try:
         system_prompt = (
@@ -173,107 +244,125 @@ async def analyze_sentiment_from_text(transcript_chunk: str, time_label: str) ->
             "- The emotional tone of the dialogue.\n"
             "- The level of engagement or disengagement.\n"
             "- The overall atmosphere (e.g., collaborative, tense, productive).\n\n"
-            "Format your response as:\n"
-            "**Time:** {time_label}\n"
-            "**Overall Emotion:** <A single dominant emotion like: Positive, Negative, Neutral, Collaborative, Tense>\n"
-            "**Key Insights:** <One or two bullet points on specific observations>"
+            "Report a single dominant overall emotion (e.g., Positive, Negative, Neutral, Collaborative, Tense) "
+            "and one or two key insights on specific observations."
         )
 
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = await limited(chat_semaphore, client.chat.completions.parse(
+            model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": transcript_chunk}
             ],
+            response_format=SentimentOutput,
             max_tokens=300
-        )
-        return response.choices[0].message.content.strip()
+        ))
+        return parsed_content(response).to_markdown(time_label)
     except Exception as e:
         print(f"❌ Error analyzing text sentiment for {time_label}: {e}")
         return f"**Time:** {time_label}\n**Error:** Sentiment analysis could not be performed for this segment."
 
-def generate_summary_and_insights(transcript: str, sentiment_analysis: str, output_dir: str) -> str:
+async def generate_summary_and_insights(transcript: str, sentiment_analysis: str, output_dir: str) -> str:
     """Generates a detailed summary, action items, and insights."""
     print("\n🔹 Generating detailed meeting report...")
     if not transcript:
         return "No transcript available to generate a report."
 
     summary_prompt = (
-        "You are a meeting assistant. Based on the full transcript provided, extract the following using Markdown formatting:\n\n"
-        "## Executive Summary\nA concise, one-paragraph overview of the meeting.\n\n"
-        "## Key Discussion Points\nA bulleted list of the main topics discussed.\n\n"
-        "## Action Items\nA bulleted list of tasks assigned with assignees (e.g., - **John:** Finalize the Q3 budget report.)"
+        "You are a meeting assistant. Based on the full transcript provided, extract:\n"
+        "- executive_summary: A concise, one-paragraph overview of the meeting.\n"
+        "- key_discussion_points: The main topics discussed.\n"
+        "- action_items: Tasks assigned, each with its assignee (e.g., John: Finalize the Q3 budget report)."
     )
     
     insights_prompt = (
-        "You are a senior analyst. Based on the transcript and sentiment summary, extract deep insights into team dynamics using Markdown formatting:\n\n"
-        "## Meeting Insights\n"
-        "- **Emotional Tone:** Describe the overall emotional atmosphere.\n"
-        "- **Engagement Level:** Comment on the participation and engagement of the team.\n"
-        "- **Potential Conflicts:** Note any areas of disagreement or tension.\n"
-        "- **Leadership Behavior:** Comment on leadership style observed."
+        "You are a senior analyst. Based on the transcript and sentiment summary, extract deep insights into team dynamics:\n"
+        "- emotional_tone: Describe the overall emotional atmosphere.\n"
+        "- engagement_level: Comment on the participation and engagement of the team.\n"
+        "- potential_conflicts: Note any areas of disagreement or tension.\n"
+        "- leadership_behavior: Comment on leadership style observed."
     )
 
     try:
-        summary_response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": summary_prompt},
-                {"role": "user", "content": transcript}
-            ], max_tokens=1000, temperature=0.4
+        # The summary and insights prompts are independent, so request them concurrently
+        summary_response, insights_response = await asyncio.gather(
+            limited(chat_semaphore, client.chat.completions.parse(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": summary_prompt},
+                    {"role": "user", "content": transcript}
+                ], response_format=MeetingSummary, max_tokens=1000, temperature=0.4
+            )),
+            limited(chat_semaphore, client.chat.completions.parse(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": insights_prompt},
+                    {"role": "user", "content": f"Transcript:\n{transcript}\n\nSentiment Summary:\n{sentiment_analysis}"}
+                ], response_format=MeetingInsights, max_tokens=1000, temperature=0.5
+            ))
         )
-        summary_content = summary_response.choices[0].message.content.strip()
-
-        insights_response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": insights_prompt},
-                {"role": "user", "content": f"Transcript:\n{transcript}\n\nSentiment Summary:\n{sentiment_analysis}"}
-            ], max_tokens=1000, temperature=0.5
-        )
-        insights_content = insights_response.choices[0].message.content.strip()
+        # Section headings are rendered here rather than spent as model output tokens
+        summary_content = parsed_content(summary_response).to_markdown()
+        insights_content = parsed_content(insights_response).to_markdown()
 
         combined_report = f"{summary_content}\n\n{insights_content}"
         
         output_path = os.path.join(output_dir, "meeting_report.txt")
-        save_text_to_file(combined_report, output_path)
+        await save_text_to_file(combined_report, output_path)
         print("✅ Detailed meeting report generated.")
         return combined_report
     except Exception as e:
         print(f"❌ Error generating detailed report: {e}")
         return "Could not generate report due to an error."
 
+BOLD_MARKDOWN_RE = re.compile(r'\*\*(.+?)\*\*')
+
+# ReportLab styles are read-only once configured, so build them once at import
+PDF_STYLES = getSampleStyleSheet()
+PDF_STYLES['Bullet'].leftIndent = 20
+
+# Line prefix -> (style, strip length, render **bold**)
+PDF_LINE_TYPES = {
+    '## ': (PDF_STYLES['h2'], 3, False),
+    '# ': (PDF_STYLES['h1'], 2, False),
+    '* ': (PDF_STYLES['Bullet'], 2, True),
+    '- ': (PDF_STYLES['Bullet'], 2, True),
+}
+
+# ReportLab builds are CPU-bound and hold the GIL, so PDFs are rendered in worker
+# processes; concurrent analyses then build on separate cores off the event loop.
+# Workers are not forked: forking the threaded server can copy a held lock into the child.
+PDF_POOL = concurrent.futures.ProcessPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    mp_context=multiprocessing.get_context(
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    ),
+)
+
 def create_beautiful_pdf(text_content: str, output_path: str):
     """Generates a clean PDF from Markdown-like text content."""
     print(f"\n🔹 Creating PDF report at {output_path}...")
     try:
         doc = SimpleDocTemplate(output_path, pagesize=letter, topMargin=inch, bottomMargin=inch)
-        styles = getSampleStyleSheet()
-        
-        h1_style = styles['h1']
-        h2_style = styles['h2']
-        body_style = styles['BodyText']
-        bullet_style = styles['Bullet']
-        bullet_style.leftIndent = 20
+        body_style = PDF_STYLES['BodyText']
         
-        story = [Paragraph("Meeting Report", styles['Title'])]
+        story = [Paragraph("Meeting Report", PDF_STYLES['Title'])]
         story.append(Spacer(1, 0.2 * inch))
         
         for line in text_content.split('\n'):
             line = line.strip()
             if not line: continue
             
-            if line.startswith('## '):
-                story.append(Paragraph(line.replace('## ', ''), h2_style))
-            elif line.startswith('# '):
-                story.append(Paragraph(line.replace('# ', ''), h1_style))
-            elif line.startswith(('* ', '- ')):
-                line_content = line[2:]
-                parts = re.split(r'(\*\*.*?\*\*)', line_content)
-                p_text = ''.join([f'<b>{p.replace("**", "")}</b>' if p.startswith('**') else p for p in parts])
-                story.append(Paragraph(p_text, bullet_style))
-            else:
+            line_type = PDF_LINE_TYPES.get(line[:3]) or PDF_LINE_TYPES.get(line[:2])
+            if line_type is None:
                 story.append(Paragraph(line, body_style))
+                continue
+
+            style, prefix_len, render_bold = line_type
+            p_text = line[prefix_len:]
+            if render_bold:
+                p_text = BOLD_MARKDOWN_RE.sub(r'<b>\1</b>', p_text)
+            story.append(Paragraph(p_text, style))
         
         doc.build(story)
         print(f"✅ PDF saved to: {output_path}")
@@ -301,52 +390,51 @@ async def main(audio_path: str, transcript_path: str):
             print("❌ Halting analysis due to audio conversion failure.")
             return
 
-        chunk_paths = await split_audio(standard_wav_path, output_dir=audio_chunks_dir)
+        chunk_paths = await split_audio(
+            standard_wav_path, output_dir=audio_chunks_dir, duration=get_wav_duration(standard_wav_path)
+        )
         if not chunk_paths:
             print("❌ Failed to create audio chunks. Using full audio for analysis.")
             chunk_paths = [standard_wav_path]
 
-        print("\n🔹 Running transcription on audio chunks...")
-        transcription_tasks = [run_transcription_agent(chunk) for chunk in chunk_paths]
-        transcription_results = await asyncio.gather(*transcription_tasks)
+        async def process_chunk(index: int, chunk_path: str):
+            """Transcribes one chunk and scores its sentiment as soon as its text is ready."""
+            result = await run_transcription_agent(chunk_path)
+            if not result.refined_translation:
+                return result, ""
+            sentiment = await analyze_sentiment_from_text(result.refined_translation, f"Segment {index+1}")
+            return result, sentiment
+
+        print("\n🔹 Running transcription and sentiment analysis on audio chunks...")
+        chunk_results = await asyncio.gather(
+            *[process_chunk(i, chunk) for i, chunk in enumerate(chunk_paths)]
+        )
         
         full_refined_transcript = "\n\n".join(
-            [res.refined_translation for res in transcription_results if res.refined_translation]
+            [res.refined_translation for res, _ in chunk_results if res.refined_translation]
+        )
+        combined_sentiment = "\n\n".join(
+            [sentiment for _, sentiment in chunk_results if sentiment]
         )
         
         if not full_refined_transcript:
             print("❌ Post-transcription failed. Using live transcript as fallback.")
             if os.path.exists(transcript_path) and os.path.getsize(transcript_path) > 0:
-                with open(transcript_path, 'r', encoding='utf-8') as f:
-                    full_refined_transcript = f.read()
+                async with aiofiles.open(transcript_path, 'r', encoding='utf-8') as f:
+                    full_refined_transcript = await f.read()
+                combined_sentiment = await analyze_sentiment_from_text(full_refined_transcript, "Segment 1")
             else:
                 print("❌ No transcript available. Cannot generate report.")
                 return
-        save_text_to_file(full_refined_transcript, transcript_path)
-
-        print("\n🔹 Running sentiment analysis on text chunks...")
-        transcript_lines = full_refined_transcript.splitlines()
-        num_lines = len(transcript_lines)
-        num_chunks = len(chunk_paths)
-        lines_per_chunk = (num_lines + num_chunks - 1) // num_chunks
-        
-        transcript_chunks = [
-            "\n".join(transcript_lines[i:i + lines_per_chunk])
-            for i in range(0, num_lines, lines_per_chunk)
-        ]
-
-        sentiment_tasks = [
-            analyze_sentiment_from_text(transcript_chunks[i], f"Segment {i+1}")
-            for i in range(min(len(chunk_paths), len(transcript_chunks)))
-        ]
-        sentiment_results = await asyncio.gather(*sentiment_tasks)
-        combined_sentiment = "\n\n".join(sentiment_results)
+        await save_text_to_file(full_refined_transcript, transcript_path)
         
-        report_content = generate_summary_and_insights(full_refined_transcript, combined_sentiment, recording_folder)
+        report_content = await generate_summary_and_insights(full_refined_transcript, combined_sentiment, recording_folder)
 
         if report_content:
             pdf_path = os.path.join(recording_folder, "meeting_report.pdf")
-            create_beautiful_pdf(report_content, pdf_path)
+            await asyncio.get_running_loop().run_in_executor(
+                PDF_POOL, create_beautiful_pdf, report_content, pdf_path
+            )
         
         print(f"\n✅ AUDIO ANALYSIS WORKFLOW COMPLETED SUCCESSFULLY! ✅")
         print(f"   Check the '{recording_folder}' directory for all generated files.")
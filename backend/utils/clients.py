@@ -0,0 +1,27 @@
+# clients.py - Shared OpenAI Client for Note Taker
+import os
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+load_dotenv()
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# One pooled connection set for every OpenAI call in the process, so TLS
+# handshakes are paid once and concurrent requests multiplex over HTTP/2.
+# The read timeout stays generous because Whisper on a 10-minute chunk is slow.
+http_client = httpx.AsyncClient(
+    http2=HAS_HTTP2,
+    limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+    timeout=httpx.Timeout(600.0, connect=10.0)
+)
+
+openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client) if OPENAI_API_KEY else None
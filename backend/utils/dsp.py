@@ -0,0 +1,64 @@
+# dsp.py - Audio Signal Helpers for Note Taker
+import numpy as np
+
+# Numba is optional; without it the same functions run as vectorized NumPy
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def pcm16_to_float32(pcm: bytes) -> np.ndarray:
+    """Converts 16-bit little-endian PCM bytes to float32 samples in [-1, 1)."""
+    return np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def rms_energy(x: np.ndarray) -> float:
+        """Root-mean-square energy of a float32 signal."""
+        n = x.shape[0]
+        if n == 0:
+            return 0.0
+        total = 0.0
+        for i in range(n):
+            total += x[i] * x[i]
+        return np.sqrt(total / n)
+
+    @njit(cache=True, fastmath=True)
+    def frame_voice_activity(x: np.ndarray, frame_len: int, threshold: float) -> np.ndarray:
+        """Flags each full frame of `frame_len` samples whose RMS energy exceeds `threshold`."""
+        num_frames = x.shape[0] // frame_len
+        active = np.zeros(num_frames, dtype=np.bool_)
+        for f in range(num_frames):
+            total = 0.0
+            start = f * frame_len
+            for i in range(start, start + frame_len):
+                total += x[i] * x[i]
+            active[f] = np.sqrt(total / frame_len) > threshold
+        return active
+else:
+    def rms_energy(x: np.ndarray) -> float:
+        """Root-mean-square energy of a float32 signal."""
+        return float(np.sqrt(np.mean(x * x))) if x.size else 0.0
+
+    def frame_voice_activity(x: np.ndarray, frame_len: int, threshold: float) -> np.ndarray:
+        """Flags each full frame of `frame_len` samples whose RMS energy exceeds `threshold`."""
+        num_frames = x.shape[0] // frame_len
+        frames = x[:num_frames * frame_len].reshape(num_frames, frame_len)
+        return np.sqrt(np.mean(frames * frames, axis=1)) > threshold
+
+
+def has_speech(pcm: bytes, sample_rate: int = 16000, threshold: float = 0.005,
+               frame_ms: int = 30, min_active_ratio: float = 0.05) -> bool:
+    """
+    Cheap energy-based voice activity check on 16-bit mono PCM.
+    Returns True when enough 30 ms frames rise above the silence threshold.
+    """
+    x = pcm16_to_float32(pcm)
+    frame_len = sample_rate * frame_ms // 1000
+    if x.shape[0] < frame_len:
+        return rms_energy(x) > threshold
+    active = frame_voice_activity(x, frame_len, threshold)
+    return active.mean() >= min_active_ratio
@@ -7,7 +7,6 @@ as PDF attachments. It supports multiple SMTP providers and includes
 professional HTML email templates.
 
 Requirements:
-- python-email-validator
 - python-dotenv (optional, for .env file support)
 
 Environment Variables Required:
@@ -16,16 +15,27 @@ Environment Variables Required:
 - SENDER_NAME: Display name (optional, defaults to "Notes Taker")
 - SMTP_SERVER: SMTP server (optional, defaults to Gmail)
 - SMTP_PORT: SMTP port (optional, defaults to 587)
+- EMAILS_PER_CONNECTION: Messages sent before a pooled SMTP connection is
+  recycled (optional, defaults to 100)
+- EMAIL_CONCURRENCY: Parallel SMTP connections used for bulk sends
+  (optional, defaults to 5)
 """
 
+import base64
+import functools
+import html
 import os
+import queue
+import re
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email import policy as email_policy
+from email.message import EmailMessage
 from pathlib import Path
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr
+from typing import Dict, Optional, List, Tuple
+from pydantic import BaseModel, field_validator
 from fastapi import HTTPException
 import logging
 from datetime import datetime
@@ -43,14 +53,125 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Static HTML email body, built once; only the placeholders change per email
+_HTML_BODY_TEMPLATE = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>Meeting Report</title>
+        </head>
+        <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; background-color: #ffffff;">
+                <!-- Header -->
+                <div style="background: linear-gradient(135deg, #9333ea 0%, #7c3aed 100%); padding: 30px 20px; text-align: center;">
+                    <h1 style="color: white; margin: 0; font-size: 28px; font-weight: bold;">📝 Notes Taker</h1>
+                    <p style="color: #e0e7ff; margin: 5px 0 0 0; font-size: 16px;">Meeting Report Delivery</p>
+                </div>
+                
+                <!-- Main Content -->
+                <div style="padding: 40px 30px; background-color: #f8fafc;">
+                    <h2 style="color: #1e293b; margin: 0 0 20px 0; font-size: 24px;">Your Meeting Report is Ready! 🎉</h2>
+                    
+                    <p style="font-size: 16px; color: #475569; margin-bottom: 25px; line-height: 1.7;">{custom_message}</p>
+                    
+                    <!-- File Info Box -->
+                    <div style="background: white; padding: 25px; border-radius: 12px; border-left: 5px solid #9333ea; margin: 25px 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                        <h3 style="margin: 0 0 15px 0; color: #9333ea; font-size: 18px; display: flex; align-items: center;">
+                            📄 Attachment Details
+                        </h3>
+                        <table style="width: 100%; border-collapse: collapse;">
+                            <tr>
+                                <td style="padding: 8px 0; color: #64748b; font-weight: 600; width: 120px;">Filename:</td>
+                                <td style="padding: 8px 0; color: #1e293b;">{filename}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 8px 0; color: #64748b; font-weight: 600;">Generated:</td>
+                                <td style="padding: 8px 0; color: #1e293b;">{current_time}</td>
+                            </tr>
+                            <tr>
+                                <td style="padding: 8px 0; color: #64748b; font-weight: 600;">Type:</td>
+                                <td style="padding: 8px 0; color: #1e293b;">PDF Document</td>
+                            </tr>
+                        </table>
+                    </div>
+                    
+                    <!-- Tips Section -->
+                    <div style="background: #eff6ff; padding: 25px; border-radius: 12px; border: 1px solid #bfdbfe; margin: 25px 0;">
+                        <h4 style="color: #1e40af; margin: 0 0 15px 0; font-size: 16px; display: flex; align-items: center;">
+                            💡 What's included in your report:
+                        </h4>
+                        <ul style="margin: 0; padding-left: 20px; color: #475569;">
+                            <li style="margin-bottom: 8px;">Complete meeting transcription</li>
+                            <li style="margin-bottom: 8px;">Key discussion points and insights</li>
+                            <li style="margin-bottom: 8px;">Automatically formatted for easy reading</li>
+                            <li style="margin-bottom: 0;">Ready to share with your team</li>
+                        </ul>
+                    </div>
+                    
+                    <!-- Call to Action -->
+                    <div style="text-align: center; margin: 35px 0;">
+                        <p style="color: #64748b; margin-bottom: 20px;">The PDF report is attached to this email and ready to download.</p>
+                        <div style="background: white; padding: 20px; border-radius: 8px; border: 2px dashed #d1d5db;">
+                            <p style="margin: 0; color: #374151; font-weight: 600;">📎 meeting_report.pdf</p>
+                            <p style="margin: 5px 0 0 0; color: #6b7280; font-size: 14px;">Click to open the attachment above</p>
+                        </div>
+                    </div>
+                </div>
+                
+                <!-- Footer -->
+                <div style="background-color: #1e293b; padding: 25px 30px; text-align: center;">
+                    <p style="color: #94a3b8; margin: 0 0 10px 0; font-size: 14px;">
+                        Generated automatically by <strong style="color: #a855f7;">Notes Taker</strong>
+                    </p>
+                    <p style="color: #64748b; margin: 0; font-size: 13px; font-style: italic;">
+                        Making meetings more productive, one transcript at a time.
+                    </p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+# Minified once at import: comments dropped, whitespace runs collapsed, and
+# one tag boundary per line so no line nears the SMTP line-length limit
+_HTML_BODY_MIN = re.sub(
+    r'>\s*<', '>\n<',
+    re.sub(r'\s+', ' ', re.sub(r'<!--.*?-->', '', _HTML_BODY_TEMPLATE, flags=re.S))
+).strip()
+
+
+# Cheap structural check for recipient addresses; the SMTP server has the final say
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def validate_email_address(value: str) -> str:
+    """Return the address stripped of surrounding whitespace, or raise ValueError"""
+    value = value.strip()
+    if not _EMAIL_RE.match(value):
+        raise ValueError(f"Invalid email address: {value}")
+    return value
+
+
 class EmailRequest(BaseModel):
     """Email request model for API validation"""
-    to_email: EmailStr
+    to_email: str
     subject: str = "Meeting Report from Notes Taker"
     message: str = "Please find your meeting report attached."
     pdf_path: str
-    cc_emails: Optional[List[EmailStr]] = None
-    bcc_emails: Optional[List[EmailStr]] = None
+    cc_emails: Optional[List[str]] = None
+    bcc_emails: Optional[List[str]] = None
+    
+    @field_validator('to_email')
+    @classmethod
+    def _check_to_email(cls, value: str) -> str:
+        return validate_email_address(value)
+    
+    @field_validator('cc_emails', 'bcc_emails')
+    @classmethod
+    def _check_copy_emails(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        return [validate_email_address(v) for v in value] if value else value
 
 
 class EmailConfig:
@@ -81,13 +202,215 @@ class EmailConfig:
         return f"EmailConfig(server={self.smtp_server}:{self.smtp_port}, sender={self.sender_email})"
 
 
+@functools.lru_cache(maxsize=1)
+def get_email_config() -> EmailConfig:
+    """
+    Return the process-wide email configuration, reading the environment only once.
+    A configuration error is not cached, so fixing the environment takes effect
+    on the next call.
+    """
+    return EmailConfig()
+
+
+EMAILS_PER_CONNECTION = int(os.getenv("EMAILS_PER_CONNECTION", "100"))
+EMAIL_CONCURRENCY = int(os.getenv("EMAIL_CONCURRENCY", "5"))
+
+# Temporary SMTP failures worth retrying with exponential backoff
+TRANSIENT_SMTP_CODES = {421, 450, 454, 554}
+EMAIL_MAX_RETRIES = 3
+EMAIL_RETRY_BASE_DELAY = 1.0  # seconds; doubled on each retry
+
+# Allow body lines up to the RFC 5322 limit so HTML can go out as 7bit/8bit
+# instead of being quoted-printable encoded just for exceeding 78 characters
+MESSAGE_POLICY = email_policy.SMTP.clone(max_line_length=998)
+
+# 57 raw bytes encode to one 76-character MIME line, so blocks that are a
+# multiple of 57 bytes concatenate into correctly wrapped base64
+BASE64_BLOCK_SIZE = 57 * 1024
+
+
+class PipelinedSMTP(smtplib.SMTP):
+    """
+    SMTP client that writes MAIL, RCPT and DATA in a single batch when the
+    server advertises PIPELINING (RFC 2920), cutting several round-trips per
+    message to one. Falls back to the standard command-by-command exchange
+    otherwise.
+    """
+    
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn('pipelining') or any(o.lower() == 'smtputf8' for o in mail_options):
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+        
+        if isinstance(msg, str):
+            msg = smtplib._fix_eols(msg).encode('ascii')
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        
+        esmtp_opts = []
+        if self.has_extn('size'):
+            esmtp_opts.append(f"size={len(msg)}")
+        esmtp_opts.extend(mail_options)
+        mail_opts = ''.join(f" {o}" for o in esmtp_opts)
+        rcpt_opts = ''.join(f" {o}" for o in rcpt_options)
+        
+        # Write the whole envelope at once, then read the replies in order
+        commands = [f"mail FROM:{smtplib.quoteaddr(from_addr)}{mail_opts}"]
+        commands += [f"rcpt TO:{smtplib.quoteaddr(addr)}{rcpt_opts}" for addr in to_addrs]
+        commands.append("data")
+        self.send(''.join(f"{c}{smtplib.CRLF}" for c in commands))
+        
+        mail_code, mail_resp = self.getreply()
+        refused = {}
+        for addr in to_addrs:
+            code, resp = self.getreply()
+            if code not in (250, 251):
+                refused[addr] = (code, resp)
+        data_code, data_resp = self.getreply()
+        
+        if data_code == 354 and (mail_code != 250 or len(refused) == len(to_addrs)):
+            # Server opened DATA despite having nothing to deliver; end it empty
+            self.send(b"." + smtplib.bCRLF)
+            self.getreply()
+        
+        if mail_code != 250:
+            if mail_code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        if len(refused) == len(to_addrs):
+            self._rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+        if data_code != 354:
+            if data_code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPDataError(data_code, data_resp)
+        
+        body = smtplib._quote_periods(msg)
+        if body[-2:] != smtplib.bCRLF:
+            body += smtplib.bCRLF
+        self.send(body + b"." + smtplib.bCRLF)
+        code, resp = self.getreply()
+        if code != 250:
+            if code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+
+
+class SMTPConnectionPool:
+    """
+    Pool of authenticated SMTP sessions reused across sends, so the
+    TCP + STARTTLS + AUTH handshake is paid once per connection instead of
+    once per email.
+    """
+    
+    def __init__(self, config: EmailConfig, max_idle: int = EMAIL_CONCURRENCY,
+                 max_messages: int = EMAILS_PER_CONNECTION):
+        self.config = config
+        self.max_messages = max_messages
+        self._idle: "queue.Queue[smtplib.SMTP]" = queue.Queue(maxsize=max_idle)
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open, secure and authenticate a new SMTP connection"""
+        try:
+            server = PipelinedSMTP(self.config.smtp_server, self.config.smtp_port, timeout=30)
+        except (smtplib.SMTPConnectError, OSError):
+            raise smtplib.SMTPException(f"Could not connect to SMTP server {self.config.smtp_server}:{self.config.smtp_port}")
+        try:
+            server.starttls()  # Enable TLS encryption
+            server.login(self.config.sender_email, self.config.sender_password)
+        except Exception:
+            self._close(server)
+            raise
+        server._msg_count = 0
+        return server
+    
+    @staticmethod
+    def _close(conn: smtplib.SMTP):
+        """Close a connection, ignoring errors from an already-dead socket"""
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+    
+    def get_conn(self) -> smtplib.SMTP:
+        """
+        Check out a live connection, reusing an idle one when it still answers NOOP
+        
+        Returns:
+            smtplib.SMTP: Authenticated SMTP connection
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close(conn)
+    
+    def return_conn(self, conn: smtplib.SMTP, msg_count: int = 1):
+        """
+        Return a healthy connection to the pool, recycling it after max_messages sends
+        
+        Args:
+            conn: Connection previously obtained from get_conn
+            msg_count: Number of messages sent on it since checkout
+        """
+        conn._msg_count += msg_count
+        if conn._msg_count >= self.max_messages:
+            self._close(conn)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._close(conn)
+    
+    def discard(self, conn: smtplib.SMTP):
+        """Drop a connection that failed mid-send instead of returning it"""
+        self._close(conn)
+    
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+# Pools are shared by every EmailService with the same server and sender
+_pools: Dict[Tuple[str, int, str], SMTPConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_smtp_pool(config: EmailConfig) -> SMTPConnectionPool:
+    """Return the shared connection pool for a configuration, creating it on first use"""
+    key = (config.smtp_server, config.smtp_port, config.sender_email)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = SMTPConnectionPool(config)
+        return _pools[key]
+
+
 class EmailService:
     """Service class to handle all email operations"""
     
     def __init__(self):
         """Initialize the email service with configuration"""
         try:
-            self.config = EmailConfig()
+            self.config = get_email_config()
+            self.pool = get_smtp_pool(self.config)
+            self._html_format = _HTML_BODY_MIN.format_map
             logger.info(f"Email service initialized: {self.config}")
         except ValueError as e:
             logger.error(f"Email configuration error: {e}")
@@ -157,6 +480,35 @@ class EmailService:
                 detail=f"An unexpected error occurred while sending email: {str(e)}"
             )
     
+    def send_bulk(self, email_requests: List[EmailRequest], concurrency: int = EMAIL_CONCURRENCY) -> List[dict]:
+        """
+        Send many emails in parallel, each worker using its own pooled SMTP connection
+        
+        Args:
+            email_requests: Emails to send
+            concurrency: Maximum number of simultaneous sends (keep within the
+                provider's concurrent-connection limit)
+            
+        Returns:
+            List[dict]: One result per request, in the same order; failed sends
+            have success=False and an error message instead of raising
+        """
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            return list(executor.map(self._send_bulk_item, email_requests))
+    
+    def _send_bulk_item(self, email_request: EmailRequest) -> dict:
+        """Send one email of a bulk batch, converting failures into a result entry"""
+        try:
+            return self.send_email_with_attachment(email_request)
+        except HTTPException as e:
+            return {
+                "success": False,
+                "message": e.detail,
+                "recipient": email_request.to_email,
+                "status_code": e.status_code,
+                "timestamp": datetime.now().isoformat()
+            }
+    
     def _validate_pdf_file(self, pdf_path: str) -> Path:
         """
         Validate that the PDF file exists and is accessible
@@ -182,7 +534,7 @@ class EmailService:
         
         return pdf_file_path
     
-    def _create_email_message(self, email_request: EmailRequest, pdf_file_path: Path) -> MIMEMultipart:
+    def _create_email_message(self, email_request: EmailRequest, pdf_file_path: Path) -> EmailMessage:
         """
         Create the complete email message with headers, body, and attachment
         
@@ -191,10 +543,10 @@ class EmailService:
             pdf_file_path: Path to the PDF file
             
         Returns:
-            MIMEMultipart: Complete email message
+            EmailMessage: Complete email message
         """
         # Create message container
-        msg = MIMEMultipart()
+        msg = EmailMessage(policy=MESSAGE_POLICY)
         
         # Set email headers
         msg['From'] = f"{self.config.sender_name} <{self.config.sender_email}>"
@@ -207,7 +559,10 @@ class EmailService:
         
         # Create HTML email body
         html_body = self._create_html_body(email_request.message, pdf_file_path.name)
-        msg.attach(MIMEText(html_body, 'html'))
+        # Let the content manager pick the transfer encoding: plain 7bit/8bit when
+        # the text allows it, so the body is not base64-inflated
+        msg.set_content(html_body, subtype='html')
+        msg.make_mixed()
         
         # Attach PDF file
         self._attach_pdf_file(msg, pdf_file_path)
@@ -227,87 +582,13 @@ class EmailService:
         """
         current_time = datetime.now().strftime("%B %d, %Y at %I:%M %p")
         
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Meeting Report</title>
-        </head>
-        <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; background-color: #ffffff;">
-                <!-- Header -->
-                <div style="background: linear-gradient(135deg, #9333ea 0%, #7c3aed 100%); padding: 30px 20px; text-align: center;">
-                    <h1 style="color: white; margin: 0; font-size: 28px; font-weight: bold;">📝 Notes Taker</h1>
-                    <p style="color: #e0e7ff; margin: 5px 0 0 0; font-size: 16px;">Meeting Report Delivery</p>
-                </div>
-                
-                <!-- Main Content -->
-                <div style="padding: 40px 30px; background-color: #f8fafc;">
-                    <h2 style="color: #1e293b; margin: 0 0 20px 0; font-size: 24px;">Your Meeting Report is Ready! 🎉</h2>
-                    
-                    <p style="font-size: 16px; color: #475569; margin-bottom: 25px; line-height: 1.7;">{custom_message}</p>
-                    
-                    <!-- File Info Box -->
-                    <div style="background: white; padding: 25px; border-radius: 12px; border-left: 5px solid #9333ea; margin: 25px 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                        <h3 style="margin: 0 0 15px 0; color: #9333ea; font-size: 18px; display: flex; align-items: center;">
-                            📄 Attachment Details
-                        </h3>
-                        <table style="width: 100%; border-collapse: collapse;">
-                            <tr>
-                                <td style="padding: 8px 0; color: #64748b; font-weight: 600; width: 120px;">Filename:</td>
-                                <td style="padding: 8px 0; color: #1e293b;">{filename}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; color: #64748b; font-weight: 600;">Generated:</td>
-                                <td style="padding: 8px 0; color: #1e293b;">{current_time}</td>
-                            </tr>
-                            <tr>
-                                <td style="padding: 8px 0; color: #64748b; font-weight: 600;">Type:</td>
-                                <td style="padding: 8px 0; color: #1e293b;">PDF Document</td>
-                            </tr>
-                        </table>
-                    </div>
-                    
-                    <!-- Tips Section -->
-                    <div style="background: #eff6ff; padding: 25px; border-radius: 12px; border: 1px solid #bfdbfe; margin: 25px 0;">
-                        <h4 style="color: #1e40af; margin: 0 0 15px 0; font-size: 16px; display: flex; align-items: center;">
-                            💡 What's included in your report:
-                        </h4>
-                        <ul style="margin: 0; padding-left: 20px; color: #475569;">
-                            <li style="margin-bottom: 8px;">Complete meeting transcription</li>
-                            <li style="margin-bottom: 8px;">Key discussion points and insights</li>
-                            <li style="margin-bottom: 8px;">Automatically formatted for easy reading</li>
-                            <li style="margin-bottom: 0;">Ready to share with your team</li>
-                        </ul>
-                    </div>
-                    
-                    <!-- Call to Action -->
-                    <div style="text-align: center; margin: 35px 0;">
-                        <p style="color: #64748b; margin-bottom: 20px;">The PDF report is attached to this email and ready to download.</p>
-                        <div style="background: white; padding: 20px; border-radius: 8px; border: 2px dashed #d1d5db;">
-                            <p style="margin: 0; color: #374151; font-weight: 600;">📎 meeting_report.pdf</p>
-                            <p style="margin: 5px 0 0 0; color: #6b7280; font-size: 14px;">Click to open the attachment above</p>
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Footer -->
-                <div style="background-color: #1e293b; padding: 25px 30px; text-align: center;">
-                    <p style="color: #94a3b8; margin: 0 0 10px 0; font-size: 14px;">
-                        Generated automatically by <strong style="color: #a855f7;">Notes Taker</strong>
-                    </p>
-                    <p style="color: #64748b; margin: 0; font-size: 13px; font-style: italic;">
-                        Making meetings more productive, one transcript at a time.
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        return self._html_format({
+            'custom_message': html.escape(custom_message),
+            'filename': html.escape(filename),
+            'current_time': current_time
+        })
     
-    def _attach_pdf_file(self, msg: MIMEMultipart, pdf_file_path: Path):
+    def _attach_pdf_file(self, msg: EmailMessage, pdf_file_path: Path):
         """
         Attach PDF file to the email message
         
@@ -316,18 +597,39 @@ class EmailService:
             pdf_file_path: Path to the PDF file
         """
         try:
-            with open(pdf_file_path, 'rb') as file:
-                pdf_attachment = MIMEApplication(file.read(), _subtype='pdf')
-                pdf_attachment.add_header(
-                    'Content-Disposition', 
-                    'attachment', 
-                    filename=pdf_file_path.name
-                )
-                msg.attach(pdf_attachment)
+            # The file is base64-encoded block by block, so the raw PDF is never
+            # held in memory alongside its encoded copy
+            pdf_attachment = EmailMessage(policy=MESSAGE_POLICY)
+            pdf_attachment['Content-Type'] = 'application/pdf'
+            pdf_attachment['Content-Transfer-Encoding'] = 'base64'
+            pdf_attachment.set_payload(self._encode_file_base64(pdf_file_path))
+            pdf_attachment.add_header(
+                'Content-Disposition', 
+                'attachment', 
+                filename=pdf_file_path.name
+            )
+            msg.attach(pdf_attachment)
         except Exception as e:
             raise Exception(f"Failed to attach PDF file: {str(e)}")
     
-    def _send_email(self, msg: MIMEMultipart, email_request: EmailRequest):
+    @staticmethod
+    def _encode_file_base64(file_path: Path) -> str:
+        """
+        Base64-encode a file in MIME-line-aligned blocks
+        
+        Args:
+            file_path: File to encode
+            
+        Returns:
+            str: Base64 text wrapped at 76 characters per line
+        """
+        parts = []
+        with open(file_path, 'rb') as file:
+            while block := file.read(BASE64_BLOCK_SIZE):
+                parts.append(base64.encodebytes(block).decode('ascii'))
+        return ''.join(parts)
+    
+    def _send_email(self, msg: EmailMessage, email_request: EmailRequest):
         """
         Send the email using SMTP
         
@@ -335,29 +637,83 @@ class EmailService:
             msg: Complete email message
             email_request: Original request with recipient details
         """
-        # Prepare recipient list (To, CC, BCC)
-        recipients = [email_request.to_email]
-        if email_request.cc_emails:
-            recipients.extend(email_request.cc_emails)
-        if email_request.bcc_emails:
-            recipients.extend(email_request.bcc_emails)
+        recipients = self._prepare_recipients(email_request)
         
-        # Connect to SMTP server and send email
-        try:
-            with smtplib.SMTP(self.config.smtp_server, self.config.smtp_port) as server:
-                server.starttls()  # Enable TLS encryption
-                server.login(self.config.sender_email, self.config.sender_password)
-                server.send_message(msg, to_addrs=recipients)
-                
-        except smtplib.SMTPConnectError as e:
-            raise smtplib.SMTPException(f"Could not connect to SMTP server {self.config.smtp_server}:{self.config.smtp_port}")
-        except smtplib.SMTPServerDisconnected as e:
-            raise smtplib.SMTPException("SMTP server disconnected unexpectedly")
+        # Send over a pooled connection; dropped connections are replaced and
+        # transient server errors are retried with exponential backoff
+        for attempt in range(EMAIL_MAX_RETRIES + 1):
+            conn = self.pool.get_conn()
+            try:
+                self._send_on(conn, msg, recipients)
+            except smtplib.SMTPServerDisconnected:
+                self.pool.discard(conn)
+                if attempt < EMAIL_MAX_RETRIES:
+                    continue
+                raise smtplib.SMTPException("SMTP server disconnected unexpectedly")
+            except smtplib.SMTPResponseException as e:
+                self.pool.discard(conn)
+                if e.smtp_code in TRANSIENT_SMTP_CODES and attempt < EMAIL_MAX_RETRIES:
+                    delay = EMAIL_RETRY_BASE_DELAY * 2 ** attempt
+                    logger.warning(f"Transient SMTP error {e.smtp_code}; retrying in {delay:.0f}s")
+                    time.sleep(delay)
+                    continue
+                raise
+            except Exception:
+                self.pool.discard(conn)
+                raise
+            self.pool.return_conn(conn)
+            return
+    
+    @staticmethod
+    def _prepare_recipients(email_request: EmailRequest) -> List[str]:
+        """
+        Build the envelope recipient list (To, CC, BCC) with duplicates removed
+        
+        Args:
+            email_request: Request with already-validated addresses
+            
+        Returns:
+            List[str]: Unique recipients, To first, in request order
+        """
+        return list(dict.fromkeys([
+            email_request.to_email,
+            *(email_request.cc_emails or ()),
+            *(email_request.bcc_emails or ()),
+        ]))
+    
+    def _send_on(self, conn: smtplib.SMTP, msg: EmailMessage, recipients: List[str]):
+        """
+        Send a prepared message over an already-authenticated connection
+        
+        Args:
+            conn: Pooled SMTP connection
+            msg: Complete email message
+            recipients: Envelope recipients (To, CC, BCC)
+        """
+        mail_options = []
+        if conn.has_extn('8bitmime'):
+            mail_options.append('BODY=8BITMIME')
+        else:
+            self._downgrade_8bit_parts(msg)
+        conn.send_message(msg, to_addrs=recipients, mail_options=mail_options)
     
-    def test_configuration(self) -> dict:
+    @staticmethod
+    def _downgrade_8bit_parts(msg: EmailMessage):
+        """Re-encode 8bit text parts as quoted-printable for servers without 8BITMIME"""
+        for part in msg.walk():
+            if part.get_content_maintype() == 'text' and part.get('Content-Transfer-Encoding') == '8bit':
+                part.set_content(part.get_content(), subtype=part.get_content_subtype(),
+                                 cte='quoted-printable')
+    
+    def test_configuration(self, deep: bool = False) -> dict:
         """
         Test the email configuration without sending an email
         
+        Args:
+            deep: Also check that the SMTP server answers, reusing a pooled
+                connection when one is idle. Off by default since a fresh
+                connection costs a TCP + TLS + AUTH handshake.
+        
         Returns:
             dict: Configuration status and details
         """
@@ -372,12 +728,15 @@ class EmailService:
                 "message": "Email configuration is valid and ready to use."
             }
             
-            # Test SMTP connection (optional - can be resource intensive)
+            if not deep:
+                config_info["connection_test"] = "not probed"
+                return config_info
+            
+            # get_conn NOOPs an idle pooled connection, or logs in a new one
             try:
-                with smtplib.SMTP(self.config.smtp_server, self.config.smtp_port, timeout=10) as server:
-                    server.starttls()
-                    # Don't actually login for testing, just check connection
-                    config_info["connection_test"] = "SMTP server is reachable"
+                conn = self.pool.get_conn()
+                self.pool.return_conn(conn, msg_count=0)
+                config_info["connection_test"] = "SMTP server is reachable"
             except Exception as e:
                 config_info["connection_test"] = f"Warning: Could not test SMTP connection: {str(e)}"
             
@@ -1,3 +1,4 @@
+import asyncio
 import threading
 import queue
 import time
@@ -5,21 +6,27 @@ import os
 import subprocess
 import sys
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 import platform
 import io
-import wave
 import re
+import struct
+from collections import deque
 
 
 load_dotenv(override=True)
 # --- Attempt to import required libraries ---
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import AsyncOpenAI
     from dotenv import load_dotenv
+    import numpy as np
+    from utils.clients import HAS_HTTP2
+    from utils.dsp import has_speech
 except ImportError as e:
     raise ImportError(
-        "A required dependency is missing. Please run: pip install openai python-dotenv. "
+        "A required dependency is missing. Please run: pip install openai python-dotenv numpy. "
         f"Original error: {e}"
     )
 
@@ -34,11 +41,41 @@ print(FFMPEG_PATH)
 AUDIO_FORMAT = "s16le" 
 # The number of bytes for one second of audio.
 AUDIO_CHUNK_SIZE = SAMPLE_RATE * CHANNELS * 2  # (Sample Rate * Channels * Bytes per Sample)
+# ffmpeg's stdout is read 5 seconds at a time and then split into 1-second chunks.
+AUDIO_READ_SIZE = AUDIO_CHUNK_SIZE * 5
+FFMPEG_PIPE_BUFSIZE = 64 * 1024
+# Set FFMPEG_DEBUG=1 to let ffmpeg's error output through to the console.
+FFMPEG_DEBUG = os.getenv("FFMPEG_DEBUG", "").lower() in ("1", "true", "yes")
+# Niceness for the capture process (negative = higher priority; needs privileges on POSIX)
+FFMPEG_NICE = -5
+
+# Live transcription sends 20-second windows that overlap by 2 seconds, up to 3 in flight.
+TRANSCRIBE_WINDOW_SECONDS = 20
+TRANSCRIBE_OVERLAP_SECONDS = 2
+TRANSCRIBE_OVERLAP_MAX_WORDS = 12
+TRANSCRIBE_WORKERS = 3
+TRANSCRIBE_MAX_ATTEMPTS = 2
+
+# 44-byte canonical WAV header for our PCM format. The RIFF size (offset 4) and
+# data size (offset 40) are left as zero and patched per chunk.
+WAV_HEADER_TEMPLATE = bytearray(struct.pack(
+    '<4sI4s4sIHHIIHH4sI',
+    b'RIFF', 0, b'WAVE',
+    b'fmt ', 16, 1, CHANNELS, SAMPLE_RATE, AUDIO_CHUNK_SIZE, CHANNELS * 2, 16,
+    b'data', 0
+))
+
+# Device listing patterns, matched against raw command output
+_DSHOW_RE = re.compile(rb'\]\s*"([^"]+)"\s+\(audio\)')
+# This regex captures both the index and the name, e.g., ['0', 'MacBook Pro Microphone']
+_AVFOUNDATION_RE = re.compile(rb'\[AVFoundation indev @ .*\] \[(\d+)\] (.+)')
+# This regex captures card, device name, and device number
+_ALSA_RE = re.compile(rb'card (\d+):.*?\[(.+?)\].*?device (\d+):')
+DEVICE_CACHE_TTL_SECONDS = 60
 
 # ——— Global State: Queues & Stop Event ———
 # These are shared across threads to coordinate their work.
 stop_event = threading.Event()
-audio_save_q = queue.Queue()
 audio_tx_q = queue.Queue() # tx stands for "transcription"
 transcript_q = queue.Queue()
 live_transcript_q = queue.Queue() # Queue for real-time WebSocket updates
@@ -46,57 +83,99 @@ live_transcript_q = queue.Queue() # Queue for real-time WebSocket updates
 # --- Helper Functions ---
 
 def _run_command(command):
-    """Internal helper to run a subprocess command."""
-    return subprocess.run(command, capture_output=True, text=True, check=False)
+    """Internal helper to run a subprocess command. Output is left as raw bytes."""
+    return subprocess.run(command, capture_output=True, check=False)
+
+# One Whisper client for every recording, so kept-alive (HTTP/2 when available)
+# connections survive start/stop cycles. It is only ever used on the transcription
+# event loop, which is why it is separate from the FastAPI app's client.
+_openai_api_key = os.getenv("OPENAI_API_KEY")
+_openai_client = AsyncOpenAI(
+    api_key=_openai_api_key,
+    http_client=httpx.AsyncClient(
+        http2=HAS_HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=10),
+        timeout=httpx.Timeout(60.0, connect=10.0)
+    )
+) if _openai_api_key else None
+
+# Event loop thread shared by all Whisper requests, started on first use
+_transcribe_loop = None
+_transcribe_semaphore = None
+_transcribe_loop_lock = threading.Lock()
+
+# (timestamp, devices) from the last list_audio_devices probe
+_device_cache = None
+_device_cache_lock = threading.Lock()
 
 def _clear_queues():
     """Empties all queues to ensure a clean state for a new recording."""
-    for q in [audio_save_q, audio_tx_q, transcript_q, live_transcript_q]:
-        while not q.empty():
-            try:
-                q.get_nowait()
-            except queue.Empty:
-                continue
+    # Clear the underlying deques in place under each queue's own lock, so
+    # code holding a reference to a queue keeps seeing the same object.
+    for q in [audio_tx_q, transcript_q, live_transcript_q]:
+        with q.mutex:
+            q.queue.clear()
 
 # --- API-Callable Functions ---
 
+def _decode_matches(matches):
+    """Decodes the groups captured by a bytes regex; each match is a str or a tuple of str."""
+    return [
+        tuple(g.decode('utf-8', errors='ignore') for g in m) if isinstance(m, tuple)
+        else m.decode('utf-8', errors='ignore')
+        for m in matches
+    ]
+
 def list_audio_devices():
     """
     Lists available audio input devices using ffmpeg. This is not interactive
     and is designed to be called by an API endpoint.
     Returns a list of device names or identifiers.
+    The result is cached for DEVICE_CACHE_TTL_SECONDS, since probing spawns a subprocess.
     """
+    global _device_cache
+    with _device_cache_lock:
+        if _device_cache is not None and time.monotonic() - _device_cache[0] < DEVICE_CACHE_TTL_SECONDS:
+            return list(_device_cache[1])
+        devices = _probe_audio_devices()
+        _device_cache = (time.monotonic(), devices)
+        return list(devices)
+
+def _probe_audio_devices():
+    """Runs the platform's device listing command and parses its raw output."""
     os_type = platform.system()
     if os_type == "Windows":
         command = ['ffmpeg', '-list_devices', 'true', '-f', 'dshow', '-i', 'dummy']
-        regex = re.compile(r'\]\s*"([^"]+)"\s+\(audio\)')
         output = _run_command(command).stderr
-        return regex.findall(output)
+        return _decode_matches(_DSHOW_RE.findall(output))
     
     if os_type == "Darwin": # macOS
         command = ['ffmpeg', '-f', 'avfoundation', '-list_devices', 'true', '-i', '""']
-        # This regex captures both the index and the name, e.g., ['0', 'MacBook Pro Microphone']
-        regex = re.compile(r'\[AVFoundation indev @ .*\] \[(\d+)\] (.+)')
         output = _run_command(command).stderr
-        return regex.findall(output)
+        return _decode_matches(_AVFOUNDATION_RE.findall(output))
         
     if os_type == "Linux":
         command = ['arecord', '-l']
-        # This regex captures card, device name, and device number
-        regex = re.compile(r'card (\d+):.*?\[(.+?)\].*?device (\d+):')
         output = _run_command(command).stdout
-        return regex.findall(output)
+        return _decode_matches(_ALSA_RE.findall(output))
         
     return []
 
-def build_ffmpeg_command(mic_device, sys_audio_device):
+def build_ffmpeg_command(mic_device, sys_audio_device, folder_path):
     """
     Constructs the platform-specific ffmpeg command for mixing audio sources.
+    The mix is encoded once and split by the tee muxer: ffmpeg writes audio.wav
+    in folder_path itself, and streams the same PCM to stdout for transcription.
     """
     os_type = platform.system()
     base_command = ['-hide_banner', '-loglevel', 'error']
     filter_command = ['-filter_complex', '[0:a][1:a]amix=inputs=2:duration=longest[aout]', '-map', '[aout]']
-    output_format_command = ['-f', AUDIO_FORMAT, '-ar', str(SAMPLE_RATE), '-ac', str(CHANNELS), 'pipe:1']
+    # Forward slashes work on every OS and avoid backslash escapes in the tee syntax
+    wav_path = Path(folder_path, "audio.wav").as_posix()
+    output_format_command = [
+        '-c:a', f'pcm_{AUDIO_FORMAT}', '-ar', str(SAMPLE_RATE), '-ac', str(CHANNELS),
+        '-f', 'tee', f'[f=wav]{wav_path}|[f={AUDIO_FORMAT}]pipe:1'
+    ]
 
     if os_type == "Windows":
         device_command = [
@@ -120,90 +199,202 @@ def build_ffmpeg_command(mic_device, sys_audio_device):
 
 # --- Core Worker Threads ---
 
+def _raise_priority(pid):
+    """
+    Lowers ffmpeg's niceness so capture is not preempted by busier processes.
+    Set after spawning rather than in preexec_fn, which is unsafe in a threaded process.
+    """
+    if not hasattr(os, "setpriority"):
+        return # Windows: handled by the creation flags
+    try:
+        os.setpriority(os.PRIO_PROCESS, pid, FFMPEG_NICE)
+    except OSError:
+        pass # Not permitted for unprivileged users; keep the default priority
+
 def _audio_recorder_thread(ffmpeg_command):
     """
     Thread target function that runs ffmpeg to capture and mix audio.
-    It reads the raw audio data from ffmpeg's stdout and puts it into two queues.
+    ffmpeg saves the WAV file itself; this reads the raw audio data from its
+    stdout and queues it for transcription.
     """
-    process = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        _capture_audio(ffmpeg_command)
+    finally:
+        # Tell the transcriber no more audio is coming, including after a failed start.
+        # It drains the queue up to this marker, so the last block is never lost.
+        audio_tx_q.put(None)
+
+def _capture_audio(ffmpeg_command):
+    """Runs ffmpeg until stop is requested or it exits, queueing 1-second chunks."""
+    # stderr is never piped: a pipe nobody reads fills up on warning spam and
+    # stalls ffmpeg mid-capture. In debug mode it goes straight to our console.
+    process = subprocess.Popen(
+        ffmpeg_command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=None if FFMPEG_DEBUG else subprocess.DEVNULL,
+        bufsize=FFMPEG_PIPE_BUFSIZE,
+        creationflags=subprocess.ABOVE_NORMAL_PRIORITY_CLASS if platform.system() == "Windows" else 0
+    )
+    _raise_priority(process.pid)
     while not stop_event.is_set():
-        # Read one second of audio data at a time
-        data = process.stdout.read(AUDIO_CHUNK_SIZE)
-        if not data:
+        # Read several seconds per call into a fresh buffer. It is not reused, because
+        # the queued chunks are views into it that the consumers read later.
+        view = memoryview(bytearray(AUDIO_READ_SIZE))
+        filled = 0
+        while filled < AUDIO_READ_SIZE:
+            n = process.stdout.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        if not filled:
             break
-        audio_save_q.put(data)
-        audio_tx_q.put(data)
+        data = view[:filled].toreadonly()
+        for start in range(0, filled, AUDIO_CHUNK_SIZE):
+            audio_tx_q.put(data[start:start + AUDIO_CHUNK_SIZE])
+        if filled < AUDIO_READ_SIZE:
+            break # ffmpeg exited
     
-    process.terminate()
     try:
-        # Wait for the process to terminate and capture any final output
-        _, stderr = process.communicate(timeout=5)
-        if stderr:
-            print(f"ffmpeg stderr: {stderr.decode('utf-8', errors='ignore')}")
+        # Ask ffmpeg to quit cleanly ('q' on stdin) so it finalizes the WAV header,
+        # then wait for it
+        process.communicate(input=b'q', timeout=5)
     except subprocess.TimeoutExpired:
         process.kill()
         print("ffmpeg process was killed due to timeout.")
 
-def _transcriber_thread():
+def _get_transcribe_loop():
     """
-    Thread target function that transcribes audio chunks in near real-time using OpenAI's Whisper API.
+    Returns the event loop that runs Whisper requests, starting it on a daemon thread
+    the first time. Requests from every recording share it, so in-flight windows
+    multiplex over the client's kept-alive connections instead of each holding a thread.
     """
-    load_dotenv()
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        print("ERROR: OPENAI_API_KEY environment variable not set. Transcription will not work.")
-        return # Exit the thread if the key is not found
-        
-    client = OpenAI(api_key=api_key)
-    
-    buffer = bytearray()
-    # Buffer audio for ~5 seconds before sending to transcription
-    min_buffer_size = AUDIO_CHUNK_SIZE * 5
+    global _transcribe_loop, _transcribe_semaphore
+    with _transcribe_loop_lock:
+        if _transcribe_loop is None:
+            _transcribe_loop = asyncio.new_event_loop()
+            _transcribe_semaphore = asyncio.Semaphore(TRANSCRIBE_WORKERS)
+            threading.Thread(target=_transcribe_loop.run_forever, daemon=True).start()
+        return _transcribe_loop
 
-    while not stop_event.is_set() or not audio_tx_q.empty():
-        try:
-            # Wait for up to 1 second for new audio data
-            chunk = audio_tx_q.get(timeout=1)
-            buffer.extend(chunk)
-            
-            # If the buffer is smaller than our minimum, keep collecting
-            if len(buffer) < min_buffer_size:
-                continue
+async def _transcribe_chunk(client, pcm):
+    """
+    Transcribes one window of raw PCM audio. Runs on the transcription event loop.
+    Returns the stripped text, or an empty string if every attempt failed.
+    """
+    async with _transcribe_semaphore:
+        return await _transcribe_with_retry(client, pcm)
 
-            # Prepare the audio data as a WAV file in memory
+async def _transcribe_with_retry(client, pcm):
+    """Sends one window to Whisper, retrying failed requests."""
+    for attempt in range(1, TRANSCRIBE_MAX_ATTEMPTS + 1):
+        try:
+            # Prepare the audio data as a WAV file in memory: patch the sizes
+            # into a copy of the header template and append the PCM as-is
+            header = WAV_HEADER_TEMPLATE.copy()
+            struct.pack_into('<I', header, 4, 36 + len(pcm))
+            struct.pack_into('<I', header, 40, len(pcm))
             wav_in_memory = io.BytesIO()
-            with wave.open(wav_in_memory, 'wb') as wf:
-                wf.setnchannels(CHANNELS)
-                wf.setsampwidth(2) # 2 bytes for 16-bit audio
-                wf.setframerate(SAMPLE_RATE)
-                wf.writeframes(buffer)
-            
+            wav_in_memory.write(header)
+            wav_in_memory.write(pcm)
             wav_in_memory.seek(0)
             wav_in_memory.name = "transcript_chunk.wav" # The API needs a file name
-            
+
             # Send to OpenAI for transcription
-            transcript_text = client.audio.transcriptions.create(
+            transcript_text = await client.audio.transcriptions.create(
                 model=OPENAI_MODEL,
                 file=wav_in_memory,
                 response_format="text"
             )
-            
-            if transcript_text and transcript_text.strip():
-                text = transcript_text.strip()
-                print(f"[LIVE TRANSCRIPT] {text}")
-                transcript_q.put(text)
-                live_transcript_q.put(text)
-            
-            # Clear the buffer after successful transcription
-            buffer.clear()
+            return transcript_text.strip() if transcript_text else ""
+        except Exception as e:
+            print(f"An error occurred while transcribing (attempt {attempt}/{TRANSCRIBE_MAX_ATTEMPTS}): {e}")
+            await asyncio.sleep(1)
+    return ""
+
+def _strip_overlap(previous, text):
+    """
+    Drops the leading words of `text` that repeat the end of `previous`, since
+    consecutive windows share TRANSCRIBE_OVERLAP_SECONDS of audio.
+    """
+    def norm(word):
+        return word.strip(".,!?;:\"'").lower()
+
+    prev_words = [norm(w) for w in previous.split()[-TRANSCRIBE_OVERLAP_MAX_WORDS:]]
+    words = text.split()
+    head = [norm(w) for w in words[:TRANSCRIBE_OVERLAP_MAX_WORDS]]
+    for k in range(min(len(prev_words), len(head)), 0, -1):
+        if prev_words[-k:] == head[:k]:
+            return " ".join(words[k:])
+    return text
+
+def _publish_transcripts(pending, previous, wait=False):
+    """
+    Pops finished transcription jobs off the front of `pending` so text is
+    published in recording order. With wait=True, blocks until all are done.
+    Returns the last published text, used to trim the next window's overlap.
+    """
+    while pending and (wait or pending[0].done()):
+        text = _strip_overlap(previous, pending.popleft().result())
+        if text:
+            print(f"[LIVE TRANSCRIPT] {text}")
+            transcript_q.put(text)
+            live_transcript_q.put(text)
+            previous = text
+    return previous
+
+def _transcriber_thread(client):
+    """
+    Thread target function that transcribes audio chunks in near real-time using OpenAI's Whisper API.
+    Audio is cut into overlapping windows that are transcribed concurrently on the shared
+    transcription event loop, so throughput is not bound by one request's round-trip at a time.
+    """
+    loop = _get_transcribe_loop()
+    
+    window_samples = SAMPLE_RATE * CHANNELS * TRANSCRIBE_WINDOW_SECONDS
+    overlap_samples = SAMPLE_RATE * CHANNELS * TRANSCRIBE_OVERLAP_SECONDS
+    # Preallocated once (plus one chunk of headroom) and filled in place
+    buffer = np.empty(window_samples + SAMPLE_RATE * CHANNELS, dtype='<i2')
+    filled = 0
+    fresh_samples = 0 # Audio in the buffer not yet sent in any window
+    pending = deque() # Futures in submission order
+    previous = ""
 
+    # Runs until the recorder's end-of-audio marker rather than until stop_event,
+    # since the recorder may still be queueing its last block after a stop
+    while True:
+        try:
+            # Wait for up to 1 second for new audio data
+            chunk = audio_tx_q.get(timeout=1)
         except queue.Empty:
-            # This is expected when the recording stops.
+            previous = _publish_transcripts(pending, previous)
             continue
-        except Exception as e:
-            print(f"An error occurred in the transcriber thread: {e}")
-            # Don't clear the buffer, try again with more data
-            time.sleep(1)
+        if chunk is None:
+            break
+
+        n = len(chunk) // 2
+        buffer[filled:filled + n] = np.frombuffer(chunk, dtype='<i2', count=n)
+        filled += n
+        fresh_samples += n
+        if filled >= window_samples:
+            window = buffer[:filled]
+            # Gate on the new audio only; the overlap carried over from the previous
+            # window would otherwise make any window that follows speech look active
+            if has_speech(buffer[filled - fresh_samples:filled], SAMPLE_RATE):
+                pending.append(asyncio.run_coroutine_threadsafe(
+                    _transcribe_chunk(client, window.tobytes()), loop
+                ))
+            # Keep the tail so the next window starts with some context
+            buffer[:overlap_samples] = buffer[filled - overlap_samples:filled]
+            filled = overlap_samples
+            fresh_samples = 0
+        previous = _publish_transcripts(pending, previous)
+
+    # Transcribe whatever was recorded after the last full window
+    window = buffer[:filled]
+    if fresh_samples >= SAMPLE_RATE * CHANNELS and has_speech(buffer[filled - fresh_samples:filled], SAMPLE_RATE):
+        pending.append(asyncio.run_coroutine_threadsafe(
+            _transcribe_chunk(client, window.tobytes()), loop
+        ))
+    _publish_transcripts(pending, previous, wait=True)
 
 # --- Main Control Functions for FastAPI ---
 
@@ -218,8 +409,7 @@ def start_recording(mic_device, sys_audio_device):
     _clear_queues()
 
     # 2. Check for OpenAI API Key (fail early if not present)
-    load_dotenv()
-    if not os.getenv("OPENAI_API_KEY"):
+    if _openai_client is None:
         raise ValueError("OPENAI_API_KEY environment variable not set.")
 
     # 3. Create a timestamped folder for the new recording
@@ -228,12 +418,12 @@ def start_recording(mic_device, sys_audio_device):
     os.makedirs(folder_path, exist_ok=True)
 
     # 4. Build the platform-specific ffmpeg command for audio only
-    ffmpeg_command = build_ffmpeg_command(mic_device, sys_audio_device)
+    ffmpeg_command = build_ffmpeg_command(mic_device, sys_audio_device, folder_path)
 
     # 5. Create and configure threads (audio recording and transcription only)
     threads = [
         threading.Thread(target=_audio_recorder_thread, args=(ffmpeg_command,), daemon=True),
-        threading.Thread(target=_transcriber_thread, daemon=True)
+        threading.Thread(target=_transcriber_thread, args=(_openai_client,), daemon=True)
     ]
 
     # 6. Start all threads
@@ -254,21 +444,10 @@ def stop_recording():
 
 def save_results(folder_path):
     """
-    Saves the final audio and transcript files from their respective queues.
+    Saves the transcript from its queue. The audio file was already written by ffmpeg.
     This should be called after all threads have been joined.
     """
-    # --- Save full mixed audio to a WAV file ---
     audio_path = os.path.join(folder_path, "audio.wav")
-    print(f"Saving audio to {audio_path}...")
-    with wave.open(audio_path, 'wb') as wf:
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(2) # 2 bytes for 16-bit audio
-        wf.setframerate(SAMPLE_RATE)
-        
-        # Drain the queue and write all frames
-        while not audio_save_q.empty():
-            wf.writeframes(audio_save_q.get())
-    print("Audio saved.")
 
     # --- Save full transcript to a text file ---
     transcript_path = os.path.join(folder_path, "transcript.txt")
@@ -0,0 +1,78 @@
+# session_store.py - Recording Session State for Note Taker
+import os
+import time
+from typing import Dict, Optional
+
+# Redis is optional; without it sessions live in this process only
+try:
+    import redis.asyncio as redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+SESSION_KEY_PREFIX = "sess:"
+# Sorted set of session ids scored by expiry time, so abandoned sessions age out of the count
+SESSION_INDEX_KEY = "sessions:expiry"
+# Sessions that are started but never uploaded (tab closed, socket dropped) expire after this
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(24 * 60 * 60)))
+
+
+class SessionStore:
+    """
+    Stores active recording sessions keyed by session id.
+
+    With REDIS_URL set (and the 'redis' package installed) sessions are kept in
+    Redis, so any uvicorn worker can serve any session and they survive reloads.
+    Otherwise they fall back to an in-process dict. Values are stored as strings.
+    Redis sessions expire SESSION_TTL_SECONDS after they are set.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self._redis = redis.from_url(redis_url, decode_responses=True) if redis_url and HAS_REDIS else None
+        self._local: Dict[str, Dict[str, str]] = {}
+
+    @property
+    def is_shared(self) -> bool:
+        return self._redis is not None
+
+    async def set(self, session_id: str, session: Dict[str, str]):
+        if self._redis is None:
+            self._local[session_id] = dict(session)
+            return
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(SESSION_KEY_PREFIX + session_id, mapping=session)
+            pipe.expire(SESSION_KEY_PREFIX + session_id, SESSION_TTL_SECONDS)
+            pipe.zadd(SESSION_INDEX_KEY, {session_id: time.time() + SESSION_TTL_SECONDS})
+            await pipe.execute()
+
+    async def get(self, session_id: str) -> Optional[Dict[str, str]]:
+        if self._redis is None:
+            return self._local.get(session_id)
+        return await self._redis.hgetall(SESSION_KEY_PREFIX + session_id) or None
+
+    async def delete(self, session_id: str):
+        if self._redis is None:
+            self._local.pop(session_id, None)
+            return
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(SESSION_KEY_PREFIX + session_id)
+            pipe.zrem(SESSION_INDEX_KEY, session_id)
+            await pipe.execute()
+
+    async def count(self) -> int:
+        if self._redis is None:
+            return len(self._local)
+        # Prune index entries whose session hash has expired before counting
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(SESSION_INDEX_KEY, "-inf", time.time())
+            pipe.zcard(SESSION_INDEX_KEY)
+            _, count = await pipe.execute()
+        return count
+
+
+def create_session_store() -> SessionStore:
+    """Builds the session store from the REDIS_URL environment variable."""
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url and not HAS_REDIS:
+        print("Warning: REDIS_URL is set but 'redis' is not installed. Sessions will be kept in-process.")
+    return SessionStore(redis_url)
@@ -159,7 +159,7 @@ const RecordingView = ({ transcript }) => {
             <div className="flex-grow bg-slate-100 dark:bg-slate-800 p-4 rounded-lg border border-slate-200 dark:border-slate-700 overflow-y-auto">
                 <h3 className="text-lg font-semibold text-purple-600 dark:text-purple-400 mb-2">Live Transcript</h3>
                 {transcript.length > 0 ? (
-                    transcript.map((line, i) => <p key={i} className="text-slate-800 dark:text-slate-300 mb-1">{line}</p>)
+                    transcript.map((line, i) => <p key={i} className="text-slate-800 dark:text-slate-300 mb-1">{line.text}</p>)
                 ) : (
                     <p className="text-slate-500">Waiting for speech...</p>
                 )}
@@ -347,7 +347,12 @@ export default function App() {
             socketRef.current.onopen = () => console.log('WebSocket connected');
             socketRef.current.onclose = () => console.log('WebSocket disconnected');
             socketRef.current.onmessage = (event) => {
-                setTranscript(prev => [...prev, event.data]);
+                // The server re-sends the whole in-progress line as 'partial' and fixes it with 'final'
+                const { type, text } = JSON.parse(event.data);
+                setTranscript(prev => {
+                    const lines = prev.length && prev[prev.length - 1].partial ? prev.slice(0, -1) : prev;
+                    return text ? [...lines, { text, partial: type === 'partial' }] : lines;
+                });
             };
 
             const stream = await navigator.mediaDevices.getUserMedia({ audio: true });